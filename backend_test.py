@@ -1,58 +1,215 @@
-import requests
+import asyncio
+import httpx
+import os
+import socket
 import sys
-import base64
-import json
-from datetime import datetime
-from pathlib import Path
+import time
+import binascii
+import orjson
+from datetime import datetime, timezone
+
+# Minimal PNG image (1x1 pixel red): PNG header + IHDR + red pixel + IEND
+_PNG_BYTES = bytes.fromhex(
+    "89504E470D0A1A0A"  # PNG signature
+    "0000000D"  # IHDR length
+    "49484452"  # IHDR
+    "00000001"  # width: 1
+    "00000001"  # height: 1
+    "0802"  # bit depth: 8, color type: 2 (RGB)
+    "000000"  # compression, filter, interlace
+    "907753DE"  # CRC
+    "0000000C"  # IDAT length
+    "49444154"  # IDAT
+    "08990101000000FFFF000000020001"  # compressed data
+    "E221BC33"  # CRC
+    "00000000"  # IEND length
+    "49454E44"  # IEND
+    "AE426082"  # CRC
+)
+# The test image never changes, so encode it once at import time
+_TEST_IMAGE_B64 = binascii.b2a_base64(memoryview(_PNG_BYTES), newline=False).decode("ascii")
+
+# /recognize-breed only accepts JSON, so pre-serialize the body rather than
+# re-encoding it on every request
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_VALID_IMAGE_BODY = b'{"image_base64":"' + _TEST_IMAGE_B64.encode("ascii") + b'"}'
+_INVALID_IMAGE_BODY = b'{"image_base64":"invalid_base64"}'
+_EMPTY_JSON = b"{}"
+
+# Acceptable error statuses for the negative recognition tests
+_INVALID_STATUSES = frozenset({400, 422, 500})
+_MISSING_STATUSES = frozenset({400, 422})
+
+# Any one of these on the preflight response shows CORS is configured
+# (lowercase, matching how httpx normalizes header names)
+_CORS_HEADERS_LOWER = frozenset({
+    'access-control-allow-origin',
+    'access-control-allow-methods',
+    'access-control-allow-headers'
+})
+
+# Gateway errors worth retrying; anything else is reported as-is
+_RETRY_STATUSES = frozenset({502, 503, 504})
+_MAX_RETRIES = 2
+_BACKOFF_FACTOR = 0.1
+
+# Upper bound on a recognition response body; the fields the test reads fit
+# well within this, so anything larger is treated as a failure
+_MAX_RESPONSE_BYTES = 65536
+
+# Fail fast on connect so an unreachable API doesn't stall every test
+_CONNECT_TIMEOUT = 3
+
+# Disable Nagle so small request frames go out immediately, and keep idle
+# pooled connections alive instead of letting middleboxes drop them
+_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+
+# Report order for test results, independent of completion order
+_TEST_ORDER = (
+    "API Health Check",
+    "Breeds Endpoint",
+    "CORS Headers",
+    "Breed Recognition - Missing Fields",
+    "Breed Recognition - Invalid Data",
+    "Breed Recognition - Valid Image",
+)
+_TEST_INDEX = {name: index for index, name in enumerate(_TEST_ORDER)}
 
 class BreedRecognitionTester:
+    __slots__ = (
+        "base_url",
+        "api_url",
+        "url_health",
+        "url_breeds",
+        "url_recognize",
+        "tests_run",
+        "tests_passed",
+        "test_results",
+        "client",
+        "_stream_logs",
+        "_log_buffer",
+        "_suite_start",
+    )
+
     def __init__(self, base_url="https://vscode-executor.preview.emergentagent.com"):
         self.base_url = base_url
         self.api_url = f"{base_url}/api"
+        self.url_health = f"{self.api_url}/"
+        self.url_breeds = f"{self.api_url}/breeds"
+        self.url_recognize = f"{self.api_url}/recognize-breed"
         self.tests_run = 0
         self.tests_passed = 0
-        self.test_results = []
+        # One slot per test, filled in place so completion order doesn't matter
+        self.test_results = [None] * len(_TEST_ORDER)
+        self._suite_start = time.monotonic_ns()
+
+        # Buffer result lines and write them once, unless CI wants live output
+        self._stream_logs = bool(os.environ.get("CI_STREAMING"))
+        self._log_buffer = []
+
+        # One pooled HTTP/2 client so concurrent tests multiplex over a single connection.
+        # The transport retries failed connects; _request retries gateway errors.
+        self.client = httpx.AsyncClient(
+            headers={"Accept-Encoding": "gzip"},
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=8),
+                retries=_MAX_RETRIES,
+                socket_options=_SOCKET_OPTIONS
+            )
+        )
+
+    async def close(self):
+        """Release pooled connections"""
+        await self.client.aclose()
+
+    async def _request(self, method, url, timeout, retry=True, stream=False, **kwargs):
+        """Send a request, retrying gateway errors with exponential backoff.
+
+        Pass retry=False when an error status is the expected outcome. With
+        stream=True the body is left unread and the caller must aclose() it.
+        """
+        timeout = httpx.Timeout(timeout, connect=_CONNECT_TIMEOUT)
+        retries = _MAX_RETRIES if retry else 0
+        for attempt in range(retries + 1):
+            request = self.client.build_request(method, url, timeout=timeout, **kwargs)
+            response = await self.client.send(request, stream=stream)
+            if response.status_code not in _RETRY_STATUSES or attempt == retries:
+                return response
+            await response.aclose()
+            await asyncio.sleep(_BACKOFF_FACTOR * (2 ** attempt))
+
+    async def _read_json(self, response, limit=_MAX_RESPONSE_BYTES):
+        """Parse a streamed JSON body, refusing to buffer more than limit bytes"""
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) > limit:
+                raise ValueError(f"Response body exceeds {limit} bytes")
+        return orjson.loads(body)
+
+    def _emit(self, line):
+        """Print a result line now when streaming, otherwise buffer it"""
+        if self._stream_logs:
+            print(line)
+        else:
+            self._log_buffer.append(line)
+
+    def flush_log(self):
+        """Write all buffered result lines in a single call"""
+        if self._log_buffer:
+            sys.stdout.write("\n".join(self._log_buffer) + "\n")
+            sys.stdout.flush()
+            self._log_buffer.clear()
 
     def log_test(self, name, success, details=""):
         """Log test result"""
         self.tests_run += 1
         if success:
             self.tests_passed += 1
-            print(f"✅ {name} - PASSED")
+            self._emit(f"✅ {name} - PASSED")
         else:
-            print(f"❌ {name} - FAILED: {details}")
+            self._emit(f"❌ {name} - FAILED: {details}")
         
-        self.test_results.append({
+        self.test_results[_TEST_INDEX[name]] = {
             "test": name,
             "success": success,
-            "details": details
-        })
+            "details": details,
+            "elapsed_ns": time.monotonic_ns() - self._suite_start
+        }
+
+    def result(self, name):
+        """Return the logged result for a test, or None if it hasn't run"""
+        return self.test_results[_TEST_INDEX[name]]
 
-    def test_api_health(self):
+    async def test_api_health(self):
         """Test basic API connectivity"""
         try:
-            response = requests.get(f"{self.api_url}/", timeout=10)
+            response = await self._request("GET", self.url_health, timeout=10)
             success = response.status_code == 200
             details = f"Status: {response.status_code}"
             if success:
-                details += f", Response: {response.json()}"
+                details += f", Response: {orjson.loads(response.content)}"
             self.log_test("API Health Check", success, details)
             return success
         except Exception as e:
             self.log_test("API Health Check", False, str(e))
             return False
 
-    def test_breeds_endpoint(self):
+    async def test_breeds_endpoint(self):
         """Test breeds listing endpoint"""
         try:
-            response = requests.get(f"{self.api_url}/breeds", timeout=10)
+            response = await self._request("GET", self.url_breeds, timeout=10)
             success = response.status_code == 200
             details = f"Status: {response.status_code}"
             
             if success:
-                data = response.json()
-                cattle_count = len(data.get('cattle', []))
-                buffalo_count = len(data.get('buffalo', []))
+                data = orjson.loads(response.content)
+                cattle_count = len(data['cattle'])
+                buffalo_count = len(data['buffalo'])
                 details += f", Cattle breeds: {cattle_count}, Buffalo breeds: {buffalo_count}"
                 
                 # Verify we have expected breeds
@@ -66,44 +223,24 @@ class BreedRecognitionTester:
             self.log_test("Breeds Endpoint", False, str(e))
             return False
 
-    def create_test_image_base64(self):
-        """Create a simple test image in base64 format"""
-        # Create a minimal PNG image (1x1 pixel red)
-        # PNG header + IHDR + red pixel + IEND
-        png_data = bytes([
-            0x89, 0x50, 0x4E, 0x47, 0x0D, 0x0A, 0x1A, 0x0A,  # PNG signature
-            0x00, 0x00, 0x00, 0x0D,  # IHDR length
-            0x49, 0x48, 0x44, 0x52,  # IHDR
-            0x00, 0x00, 0x00, 0x01,  # width: 1
-            0x00, 0x00, 0x00, 0x01,  # height: 1
-            0x08, 0x02,              # bit depth: 8, color type: 2 (RGB)
-            0x00, 0x00, 0x00,        # compression, filter, interlace
-            0x90, 0x77, 0x53, 0xDE,  # CRC
-            0x00, 0x00, 0x00, 0x0C,  # IDAT length
-            0x49, 0x44, 0x41, 0x54,  # IDAT
-            0x08, 0x99, 0x01, 0x01, 0x00, 0x00, 0x00, 0xFF, 0xFF, 0x00, 0x00, 0x00, 0x02, 0x00, 0x01,  # compressed data
-            0xE2, 0x21, 0xBC, 0x33,  # CRC
-            0x00, 0x00, 0x00, 0x00,  # IEND length
-            0x49, 0x45, 0x4E, 0x44,  # IEND
-            0xAE, 0x42, 0x60, 0x82   # CRC
-        ])
-        return base64.b64encode(png_data).decode('utf-8')
-
-    def test_breed_recognition_invalid_data(self):
+    async def test_breed_recognition_invalid_data(self):
         """Test breed recognition with invalid data"""
         try:
             # Test with invalid base64
-            response = requests.post(
-                f"{self.api_url}/recognize-breed",
-                json={"image_base64": "invalid_base64"},
+            response = await self._request(
+                "POST",
+                self.url_recognize,
+                content=_INVALID_IMAGE_BODY,
+                headers=_JSON_HEADERS,
+                retry=False,
                 timeout=30
             )
             
-            success = response.status_code in [400, 422, 500]  # Should fail gracefully
+            success = response.status_code in _INVALID_STATUSES  # Should fail gracefully
             details = f"Status: {response.status_code}"
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 if not data.get('success', True):
                     success = True  # API correctly returned error in response
                     details += f", Error handled: {data.get('error', 'Unknown error')}"
@@ -117,30 +254,35 @@ class BreedRecognitionTester:
             self.log_test("Breed Recognition - Invalid Data", False, str(e))
             return False
 
-    def test_breed_recognition_valid_image(self):
+    async def test_breed_recognition_valid_image(self):
         """Test breed recognition with valid image"""
         try:
-            test_image = self.create_test_image_base64()
-            
-            response = requests.post(
-                f"{self.api_url}/recognize-breed",
-                json={"image_base64": test_image},
-                timeout=60  # AI processing can take time
+            response = await self._request(
+                "POST",
+                self.url_recognize,
+                content=_VALID_IMAGE_BODY,
+                headers=_JSON_HEADERS,
+                timeout=60,  # AI processing can take time
+                stream=True
             )
             
-            success = response.status_code == 200
-            details = f"Status: {response.status_code}"
-            
-            if success:
-                data = response.json()
-                details += f", Success: {data.get('success')}"
+            try:
+                success = response.status_code == 200
+                details = f"Status: {response.status_code}"
                 
-                if data.get('success'):
-                    details += f", Breed: {data.get('breed')}, Animal: {data.get('animal_type')}, Confidence: {data.get('confidence')}"
-                else:
-                    details += f", Error: {data.get('error')}"
-                    # For test image, error is acceptable since it's not a real animal
-                    success = True
+                if success:
+                    data = await self._read_json(response)
+                    recognized = data.get('success')
+                    details += f", Success: {recognized}"
+                    
+                    if recognized:
+                        details += f", Breed: {data.get('breed')}, Animal: {data.get('animal_type')}, Confidence: {data.get('confidence')}"
+                    else:
+                        details += f", Error: {data.get('error')}"
+                        # For test image, error is acceptable since it's not a real animal
+                        success = True
+            finally:
+                await response.aclose()
             
             self.log_test("Breed Recognition - Valid Image", success, details)
             return success
@@ -148,16 +290,19 @@ class BreedRecognitionTester:
             self.log_test("Breed Recognition - Valid Image", False, str(e))
             return False
 
-    def test_breed_recognition_missing_fields(self):
+    async def test_breed_recognition_missing_fields(self):
         """Test breed recognition with missing required fields"""
         try:
-            response = requests.post(
-                f"{self.api_url}/recognize-breed",
-                json={},  # Missing image_base64
+            response = await self._request(
+                "POST",
+                self.url_recognize,
+                content=_EMPTY_JSON,  # Missing image_base64
+                headers=_JSON_HEADERS,
+                retry=False,
                 timeout=10
             )
             
-            success = response.status_code in [400, 422]  # Should return validation error
+            success = response.status_code in _MISSING_STATUSES  # Should return validation error
             details = f"Status: {response.status_code}"
             
             self.log_test("Breed Recognition - Missing Fields", success, details)
@@ -166,21 +311,15 @@ class BreedRecognitionTester:
             self.log_test("Breed Recognition - Missing Fields", False, str(e))
             return False
 
-    def test_cors_headers(self):
+    async def test_cors_headers(self):
         """Test CORS headers are present"""
         try:
-            response = requests.options(f"{self.api_url}/recognize-breed", timeout=10)
-            
-            cors_headers = [
-                'Access-Control-Allow-Origin',
-                'Access-Control-Allow-Methods',
-                'Access-Control-Allow-Headers'
-            ]
+            response = await self._request("OPTIONS", self.url_recognize, timeout=10)
             
-            present_headers = [h for h in cors_headers if h in response.headers]
-            success = len(present_headers) >= 1  # At least one CORS header should be present
+            present_headers = _CORS_HEADERS_LOWER.intersection(response.headers.keys())
+            success = bool(present_headers)  # At least one CORS header should be present
             
-            details = f"Status: {response.status_code}, CORS headers: {present_headers}"
+            details = f"Status: {response.status_code}, CORS headers: {sorted(present_headers)}"
             
             self.log_test("CORS Headers", success, details)
             return success
@@ -188,28 +327,41 @@ class BreedRecognitionTester:
             self.log_test("CORS Headers", False, str(e))
             return False
 
-    def run_all_tests(self):
+    async def _run_concurrently(self, tests):
+        """Run test coroutines together, recording any that crash"""
+        outcomes = await asyncio.gather(*[test() for test in tests], return_exceptions=True)
+        for test, outcome in zip(tests, outcomes):
+            if isinstance(outcome, Exception):
+                self._emit(f"❌ {test.__name__} - CRASHED: {str(outcome)}")
+                self.tests_run += 1
+        return outcomes
+
+    async def _pipeline_probe(self):
+        """Send the health and CORS probes together over one multiplexed connection"""
+        healthy, _ = await self._run_concurrently([self.test_api_health, self.test_cors_headers])
+        return healthy is True
+
+    async def run_all_tests(self):
         """Run all backend tests"""
         print("🧪 Starting Backend API Tests...")
         print(f"🌐 Testing against: {self.base_url}")
         print("=" * 60)
         
-        # Run tests in order
-        tests = [
-            self.test_api_health,
-            self.test_breeds_endpoint,
-            self.test_cors_headers,
-            self.test_breed_recognition_missing_fields,
-            self.test_breed_recognition_invalid_data,
-            self.test_breed_recognition_valid_image,
-        ]
+        # Bail out early if the API is down rather than waiting on every timeout
+        if await self._pipeline_probe():
+            # Remaining tests are independent, so run them concurrently
+            await self._run_concurrently([
+                self.test_breeds_endpoint,
+                self.test_breed_recognition_missing_fields,
+                self.test_breed_recognition_invalid_data,
+                self.test_breed_recognition_valid_image,
+            ])
+        else:
+            for name, result in zip(_TEST_ORDER, self.test_results):
+                if result is None:
+                    self.log_test(name, False, "Skipped - API unreachable")
         
-        for test in tests:
-            try:
-                test()
-            except Exception as e:
-                print(f"❌ {test.__name__} - CRASHED: {str(e)}")
-                self.tests_run += 1
+        self.flush_log()
         
         print("=" * 60)
         print(f"📊 Backend Tests Summary: {self.tests_passed}/{self.tests_run} passed")
@@ -221,15 +373,17 @@ class BreedRecognitionTester:
         else:
             print("🚨 Multiple backend failures detected")
         
-        return self.tests_passed, self.tests_run, self.test_results
+        await self.close()
+        results = [result for result in self.test_results if result is not None]
+        return self.tests_passed, self.tests_run, results
 
 def main():
     tester = BreedRecognitionTester()
-    passed, total, results = tester.run_all_tests()
+    passed, total, results = asyncio.run(tester.run_all_tests())
     
     # Save detailed results
     results_data = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": datetime.now(timezone.utc),  # orjson serializes datetimes natively
         "summary": {
             "passed": passed,
             "total": total,
@@ -238,8 +392,8 @@ def main():
         "tests": results
     }
     
-    with open("/app/backend_test_results.json", "w") as f:
-        json.dump(results_data, f, indent=2)
+    with open("/app/backend_test_results.json", "wb") as f:
+        f.write(orjson.dumps(results_data, option=orjson.OPT_INDENT_2))
     
     print(f"\n📄 Detailed results saved to: /app/backend_test_results.json")
     
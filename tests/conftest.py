@@ -0,0 +1,19 @@
+import os
+
+import pytest_asyncio
+
+from backend_test import BreedRecognitionTester
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def tester():
+    """Shared tester (and its pooled HTTP/2 client) for the whole session.
+
+    Set BACKEND_URL to point at a different deployment. Under pytest-xdist
+    (`pytest -n auto`) each worker process gets its own client.
+    """
+    base_url = os.environ.get("BACKEND_URL")
+    tester = BreedRecognitionTester(base_url) if base_url else BreedRecognitionTester()
+    yield tester
+    tester.flush_log()
+    await tester.close()
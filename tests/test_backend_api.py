@@ -0,0 +1,30 @@
+import pytest
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+async def test_api_health(tester):
+    assert await tester.test_api_health(), tester.result("API Health Check")["details"]
+
+
+async def test_breeds_endpoint(tester):
+    assert await tester.test_breeds_endpoint(), tester.result("Breeds Endpoint")["details"]
+
+
+async def test_cors_headers(tester):
+    assert await tester.test_cors_headers(), tester.result("CORS Headers")["details"]
+
+
+async def test_breed_recognition_missing_fields(tester):
+    assert await tester.test_breed_recognition_missing_fields(), \
+        tester.result("Breed Recognition - Missing Fields")["details"]
+
+
+async def test_breed_recognition_invalid_data(tester):
+    assert await tester.test_breed_recognition_invalid_data(), \
+        tester.result("Breed Recognition - Invalid Data")["details"]
+
+
+async def test_breed_recognition_valid_image(tester):
+    assert await tester.test_breed_recognition_valid_image(), \
+        tester.result("Breed Recognition - Valid Image")["details"]
@@ -0,0 +1,131 @@
+import asyncio
+
+import httpx
+import orjson
+import pytest
+
+import backend_test
+from backend_test import BreedRecognitionTester
+
+pytestmark = pytest.mark.asyncio
+
+_BREEDS = {"cattle": list("abcde"), "buffalo": list("abcde")}
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(backend_test, "_BACKOFF_FACTOR", 0)
+
+
+def _tester(handler):
+    """Tester whose client answers from handler instead of the network"""
+    tester = BreedRecognitionTester("https://backend.test")
+    tester.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return tester
+
+
+def _healthy_api(request):
+    """Minimal stand-in for the real API where every check passes"""
+    path = request.url.path
+    if request.method == "OPTIONS":
+        return httpx.Response(200, headers={"Access-Control-Allow-Origin": "*"})
+    if path == "/api/":
+        return httpx.Response(200, json={"message": "ok"})
+    if path == "/api/breeds":
+        return httpx.Response(200, json=_BREEDS)
+    body = orjson.loads(request.content)
+    if "image_base64" not in body:
+        return httpx.Response(422, json={"detail": "missing"})
+    if body["image_base64"] == "invalid_base64":
+        return httpx.Response(500, json={"detail": "bad"})
+    return httpx.Response(200, json={"success": False, "error": "not an animal"})
+
+
+async def test_gateway_errors_are_retried():
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        return httpx.Response(503)
+
+    tester = _tester(handler)
+    assert not await tester.test_breeds_endpoint()
+    assert len(attempts) == backend_test._MAX_RETRIES + 1
+    assert tester.result("Breeds Endpoint")["details"] == "Status: 503"
+    await tester.close()
+
+
+async def test_retry_recovers_after_gateway_error():
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        if len(attempts) == 1:
+            return httpx.Response(502)
+        return httpx.Response(200, json=_BREEDS)
+
+    tester = _tester(handler)
+    assert await tester.test_breeds_endpoint()
+    assert len(attempts) == 2
+    await tester.close()
+
+
+async def test_streamed_request_is_retried():
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        return httpx.Response(504)
+
+    tester = _tester(handler)
+    assert not await tester.test_breed_recognition_valid_image()
+    assert len(attempts) == backend_test._MAX_RETRIES + 1
+    await tester.close()
+
+
+async def test_expected_failures_are_not_retried():
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        return httpx.Response(503)
+
+    tester = _tester(handler)
+    await tester.test_breed_recognition_invalid_data()
+    await tester.test_breed_recognition_missing_fields()
+    assert len(attempts) == 2
+    await tester.close()
+
+
+async def test_oversized_response_fails():
+    limit = backend_test._MAX_RESPONSE_BYTES
+    oversized = b'{"success":false,"error":"' + b"x" * limit + b'"}'
+
+    tester = _tester(lambda request: httpx.Response(200, content=oversized))
+    assert not await tester.test_breed_recognition_valid_image()
+    details = tester.result("Breed Recognition - Valid Image")["details"]
+    assert details == f"Response body exceeds {limit} bytes"
+    await tester.close()
+
+
+async def test_unreachable_api_skips_remaining_tests():
+    def handler(request):
+        raise httpx.ConnectError("Name or service not known", request=request)
+
+    passed, total, results = await _tester(handler).run_all_tests()
+    assert (passed, total) == (0, len(backend_test._TEST_ORDER))
+    assert results[0]["details"] == "Name or service not known"
+    skipped = [result for result in results if result["details"] == "Skipped - API unreachable"]
+    assert len(skipped) == len(backend_test._TEST_ORDER) - 2  # health and CORS actually ran
+
+
+async def test_results_keep_report_order():
+    async def handler(request):
+        # Make the first test in report order finish last among the rest
+        if request.url.path == "/api/breeds":
+            await asyncio.sleep(0.05)
+        return _healthy_api(request)
+
+    passed, total, results = await _tester(handler).run_all_tests()
+    assert passed == total == len(backend_test._TEST_ORDER)
+    assert [result["test"] for result in results] == list(backend_test._TEST_ORDER)